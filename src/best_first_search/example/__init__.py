@@ -1,6 +1,7 @@
 """Example usages of best_first_search"""
 from .a_star import a_star, a_star_debug
+from .a_star_grid import a_star_grid
 
 __all__ = [
-    'a_star', 'a_star_debug',
+    'a_star', 'a_star_debug', 'a_star_grid',
 ]
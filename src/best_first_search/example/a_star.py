@@ -1,31 +1,77 @@
 """overly-simplified A* implementation using best first search"""
-from typing import Iterator, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from functools import partial
-import math
 import operator
 
 import networkx as nx
+import numpy as np
 
 from best_first_search import best_first_search
 
-
-def estimated_cost(xy: Tuple[int, int], end: Tuple[int, int]) -> float:
-    """Heuristic function"""
-    x, y = xy
-    return 0.5 * math.sqrt((end[0] - x) ** 2 + (end[1] - y) ** 2)
-
-
-def get_neighbor(xy: Tuple[int, int], graph: nx.Graph, end: Tuple[int, int]
-) -> Iterator[Tuple[float, Tuple[int, int]]]:
+Number = Union[int, float]
+
+
+class Adjacency(NamedTuple):
+    """Compressed sparse row adjacency of a graph, whose nodes are renamed to `0, 1, ...`"""
+    nodes: List[Tuple[int, int]]
+    node2id: Dict[Tuple[int, int], int]
+    indptr: List[int]  # neighbors of `i` are at `indptr[i]:indptr[i + 1]` of below
+    indices: List[int]
+    weights: List[Number]
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph, cost_scale: Optional[int] = None) -> 'Adjacency':
+        """Convert graph with `weight` property on edges"""
+        nodes = list(graph.nodes)
+        node2id = {node: i for i, node in enumerate(nodes)}
+        indptr = [0]
+        indices: List[int] = []
+        weights: List[Number] = []
+        for node in nodes:
+            for _node, data in graph.adj[node].items():
+                indices.append(node2id[_node])
+                weights.append(data['weight'] if cost_scale is None else round(cost_scale * data['weight']))
+            indptr.append(len(indices))
+        return cls(nodes, node2id, indptr, indices, weights)
+
+
+def estimated_costs(
+    xys: Iterable[Tuple[int, int]], end: Tuple[int, int], cost_scale: Optional[int] = None,
+) -> List[Number]:
+    """Heuristic function, evaluated at once for all the given nodes.
+
+    When `cost_scale` is given, costs are multiplied by it and floored to integers,
+    so that the heuristic stays admissible.
+    """
+    coords = np.array(list(xys), dtype=float).reshape(-1, 2)
+    costs = 0.5 * np.sqrt(((coords - np.array(end, dtype=float)) ** 2).sum(axis=1))
+    if cost_scale is not None:
+        costs = np.floor(cost_scale * costs).astype(np.int32)
+    return costs.tolist()
+
+
+class SortedNeighbors(NamedTuple):
+    """Neighbors of each node with heuristic-adjusted costs, sorted once for the whole search"""
+    indptr: List[int]  # neighbors of `i` are at `indptr[i]:indptr[i + 1]` of below
+    indices: List[int]
+    costs: List[Number]
+
+    @classmethod
+    def from_adjacency(cls, adjacency: Adjacency, heuristic: List[Number]) -> 'SortedNeighbors':
+        """Adjust edge weights by heuristic, then sort each node's neighbors by it"""
+        indptr = np.array(adjacency.indptr)
+        indices = np.array(adjacency.indices, dtype=np.int64)
+        _heuristic = np.array(heuristic)
+        sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        costs = np.array(adjacency.weights) + _heuristic[indices] - _heuristic[sources]
+        order = np.lexsort((indices, costs, sources))
+        return cls(adjacency.indptr, indices[order].tolist(), costs[order].tolist())
+
+
+def get_neighbor(i: int, neighbors: SortedNeighbors) -> Iterator[Tuple[Number, int]]:
     """Pre-sorted neighbor iterator from graph"""
-    x, y = xy
-    cost_previous = estimated_cost(xy, end)
-    neighbors = [
-        (data['weight'] + estimated_cost(_xy, end) - cost_previous, _xy)
-        for _, _xy, data in graph.edges((x, y), data=True)
-    ]
-    neighbors.sort()
-    yield from neighbors
+    begin, end = neighbors.indptr[i], neighbors.indptr[i + 1]
+    return zip(neighbors.costs[begin:end], neighbors.indices[begin:end])
 
 
 def a_star(
@@ -33,6 +79,7 @@ def a_star(
     start: Tuple[int, int],
     end: Tuple[int, int],
     n_thread: int = 0,
+    cost_scale: Optional[int] = None,
 ) -> Optional[Tuple[float, int, Tuple[Tuple[int, int], ...]]]:
     """Find shortest path from `start` to `end`.
 
@@ -41,6 +88,8 @@ def a_star(
         start: starting node
         end: ending node
         n_thread: number of threads to run
+        cost_scale: when given, search with costs multiplied by it and rounded to integers.
+            Useful when weights are integers, as integer costs allow a bucket queue.
 
     Returns:
         float: cost of the found path
@@ -48,19 +97,31 @@ def a_star(
 
         None when a solution is not found
     """
-    def is_solution(n):
-        return n == end
-
-    # run solver
+    adjacency = Adjacency.from_graph(graph, cost_scale)
+    if start not in adjacency.node2id or end not in adjacency.node2id:
+        # a node out of the graph has no edges, so only the empty path may reach `end`
+        return (0., 0, (start,)) if start == end else None
+    heuristic = estimated_costs(adjacency.nodes, end, cost_scale)
+    neighbors = SortedNeighbors.from_adjacency(adjacency, heuristic)
+    start_id = adjacency.node2id[start]
+    end_id = adjacency.node2id[end]
+
+    # run solver; operator.eq compares nodes without a Python frame, and returns a real bool
     solution_iterator = best_first_search(
-        estimated_cost(start, end), start, partial(get_neighbor, graph=graph, end=end), is_solution,
+        heuristic[start_id], start_id,
+        partial(get_neighbor, neighbors=neighbors), partial(operator.eq, end_id),
         cost_add=operator.add,
         n_thread=n_thread,
+        n_nodes=len(adjacency.nodes),
+        integer_cost=cost_scale is not None,
     )
     try:
-        return next(solution_iterator)
+        cost, n_iter, solution = next(solution_iterator)
     except StopIteration:
         return None
+    if cost_scale is not None:
+        cost /= cost_scale
+    return cost, n_iter, tuple(adjacency.nodes[i] for i in solution)
 
 
 def a_star_debug(
@@ -70,20 +131,25 @@ def a_star_debug(
     n_thread: int = 0,
 ) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:  # pragma: no cover
     """Same as a_star, but return list of edges in search order"""
-    edges = []
-
-    def is_solution(n: Tuple[int, int]) -> bool:
-        return n == end
-
-    def _get_neighbor(xy: Tuple[int, int]) -> Iterator[Tuple[float, Tuple[int, int]]]:
-        for cost, _xy in get_neighbor(xy, graph, end):
-            edges.append((xy, _xy))
-            yield (cost, _xy)
+    edges: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+    adjacency = Adjacency.from_graph(graph)
+    if start not in adjacency.node2id or end not in adjacency.node2id:
+        return edges
+    heuristic = estimated_costs(adjacency.nodes, end)
+    neighbors = SortedNeighbors.from_adjacency(adjacency, heuristic)
+    start_id = adjacency.node2id[start]
+    end_id = adjacency.node2id[end]
+
+    def _get_neighbor(i: int) -> Iterator[Tuple[Number, int]]:
+        for cost, j in get_neighbor(i, neighbors):
+            edges.append((adjacency.nodes[i], adjacency.nodes[j]))
+            yield (cost, j)
 
     solution_iterator = best_first_search(
-        estimated_cost(start, end), start, _get_neighbor, is_solution,
+        heuristic[start_id], start_id, _get_neighbor, partial(operator.eq, end_id),
         cost_add=operator.add,
         n_thread=n_thread,
+        n_nodes=len(adjacency.nodes),
     )
     try:
         next(solution_iterator)
@@ -1,11 +1,10 @@
 """
 Lazily evaluated min-heap that pertains sorted iterators instead of actual items.
 """
-from typing import Any, Deque, Generic, Iterator, List, Optional, Protocol, Tuple, Type, TypeVar, cast
+from typing import Any, Deque, Dict, Generic, Iterator, List, Optional, Protocol, Tuple, Type, TypeVar, cast
 from collections import deque
-from concurrent.futures import Future, ThreadPoolExecutor
-from heapq import heappop, heappush
-from threading import Lock
+from heapq import heappop, heappush, heapreplace
+from threading import Condition, Lock, Thread
 
 Node = TypeVar("Node")
 Cost = TypeVar("Cost", bound="SupportsComparison")
@@ -31,11 +30,25 @@ class LazyHeap(Generic[Cost, Node]):
 
     def pop(self) -> Optional[Tuple[Cost, Node]]:
         """Pop the minimum cost item from this heap"""
+        out: List[Any] = [None, None]
+        if not self.pop_into(out):
+            return None
+        return (out[0], out[1])
+
+    def pop_into(self, out: List[Any]) -> bool:
+        """
+        Pop the minimum cost item from this heap, into `out[0]` (cost) and `out[1]` (node).
+        Returns False when the heap is exhausted.
+        """
+        del out  # implemented by subclasses
+        return False
 
     @classmethod
-    def new(cls: Type[_Self], n_thread: int = 0) -> _Self:
+    def new(cls: Type[_Self], n_thread: int = 0, integer_cost: bool = False) -> _Self:
         """Factory to make lazy heap"""
         if n_thread <= 0:
+            if integer_cost:
+                return cast(_Self, LazyBucketQueue())
             return cast(_Self, LazyHeapSingleThread())
         return cast(_Self, LazyHeapMultithread(n_thread))
 
@@ -61,24 +74,80 @@ class LazyHeapSingleThread(LazyHeap[Cost, Node]):
     def stop(self) -> None:
         pass
 
-    def pop(self) -> Optional[Tuple[Cost, Node]]:
+    def pop_into(self, out: List[Any]) -> bool:
         """Pop the minimum cost item from this heap"""
-        while self.heap:
-            cost, _, node, rest = heappop(self.heap)
-            try:
-                cost_next, node_next = next(rest)
-                heappush(self.heap, (cost_next, self.index, node_next, rest))
-                self.index += 1
-            except StopIteration:
-                pass
-            return (cost, node)
-        return None
+        if not self.heap:
+            return False
+        out[0], _, out[1], rest = self.heap[0]
+        try:
+            cost_next, node_next = next(rest)
+        except StopIteration:
+            heappop(self.heap)
+        else:
+            # replace the root in a single sift
+            heapreplace(self.heap, (cost_next, self.index, node_next, rest))
+            self.index += 1
+        return True
 
     push.__doc__ = LazyHeap.push.__doc__
-    pop.__doc__ = LazyHeap.pop.__doc__
+    pop_into.__doc__ = LazyHeap.pop_into.__doc__
 
 
-class LazyHeapMultithread(LazyHeap[Cost, Node]):
+class LazyBucketQueue(LazyHeap[Cost, Node]):
+    """
+    single thread lazy heap for non-negative integer costs.
+
+    Each cost has its own FIFO bucket, so that push and pop do not sift.
+    Popping scans costs upwards from the last popped one, which is cheap when costs span a small range.
+    """
+    def __init__(self) -> None:
+        self.buckets: Dict[Any, Deque[Tuple[Node, SortedIterator[Cost, Node]]]] = {}
+        self.cost_min: Any = 0  # no bucket below this cost
+        self.size: int = 0
+
+    def push(self, sorted_iterator: SortedIterator[Cost, Node]) -> None:
+        """Push items to this heap"""
+        if (item := next(sorted_iterator, None)) is not None:
+            self._put(item[0], item[1], sorted_iterator)
+
+    def stop(self) -> None:
+        pass
+
+    def pop_into(self, out: List[Any]) -> bool:
+        """Pop the minimum cost item from this heap"""
+        if self.size == 0:
+            return False
+        cost = self.cost_min
+        while (bucket := self.buckets.get(cost)) is None:
+            cost += 1
+        self.cost_min = cost
+
+        out[0] = cost
+        out[1], rest = bucket.popleft()
+        if not bucket:
+            del self.buckets[cost]
+        self.size -= 1
+
+        if (item := next(rest, None)) is not None:
+            self._put(item[0], item[1], rest)
+        return True
+
+    def _put(self, cost: Any, node: Node, sorted_iterator: SortedIterator[Cost, Node]) -> None:
+        if cost < 0 or cost != int(cost):
+            raise ValueError(f"Bucket queue requires non-negative integer costs, got {cost}")
+        if (bucket := self.buckets.get(cost)) is None:
+            bucket = self.buckets[cost] = deque()
+        bucket.append((node, sorted_iterator))
+        if cost < self.cost_min:
+            self.cost_min = cost
+        self.size += 1
+
+    push.__doc__ = LazyHeap.push.__doc__
+    pop_into.__doc__ = LazyHeap.pop_into.__doc__
+
+
+# Shared state is read in the hot paths under one lock; grouping it would add a lookup per access
+class LazyHeapMultithread(LazyHeap[Cost, Node]):  # pylint: disable=too-many-instance-attributes
     """
     Multithreaded lazy heap. Not thread-safe.
 
@@ -93,69 +162,91 @@ class LazyHeapMultithread(LazyHeap[Cost, Node]):
     |                             |
     +------Internal Iterator------+
 
-    1. Popper: When others pushing, wait then pop
-    2. Pusher: When others pushing, wait then push
-               When others popping, push then release
+    1. Popper: When container is empty while iterators are being advanced, wait then pop
+    2. Pusher: Queue the iterator, then return immediately
+    3. Workers: A fixed set of threads advance queued iterators into the container
     """
     def __init__(self, n_thread: int) -> None:
         assert n_thread > 0
+        # Order of workers is arbitrary anyway, so the same cost is tie-broken by
+        # the iterator's identity, unique among the entries, instead of a shared counter
         self.heap: List[Tuple[Cost, int, Node, SortedIterator[Cost, Node]]] = []
-        self.index: int = 0  # in case of the same cost, force FIFO
         self.lock_heap = Lock()
-        self.internal_threads = ThreadPoolExecutor(n_thread)
-        self.futures: Deque[Future] = deque()
+        self.has_work = Condition(self.lock_heap)
+        self.has_item = Condition(self.lock_heap)
+        self.pending: Deque[SortedIterator[Cost, Node]] = deque()
+        self.n_outstanding: int = 0  # iterators either pending or being advanced
+        self.stopped = False
+        self.exception: Optional[BaseException] = None
+        self.internal_threads = [Thread(target=self._work, daemon=True) for _ in range(n_thread)]
+        for thread in self.internal_threads:
+            thread.start()
 
     def push(self, sorted_iterator: SortedIterator[Cost, Node]) -> None:
         """Push items to this heap"""
-        self.futures.append(
-            self.internal_threads.submit(
-                self._internal_push, sorted_iterator,
-            )
-        )
+        with self.lock_heap:
+            if self.stopped:
+                return  # no worker is left to advance it
+            self.pending.append(sorted_iterator)
+            self.n_outstanding += 1
+            self.has_work.notify()
 
     def stop(self) -> None:
-        for fut in self.futures:
-            fut.cancel()
-        self.internal_threads.shutdown()
-
-    def pop(self) -> Optional[Tuple[Cost, Node]]:
+        # Workers notice the flag on their next turn; iterators being advanced are
+        # not waited for, and the queued ones are dropped right away
+        with self.lock_heap:
+            self.stopped = True
+            self.pending.clear()
+            self.heap.clear()
+            self.n_outstanding = 0
+            self.has_item.notify_all()
+            self.has_work.notify_all()
+
+    def pop_into(self, out: List[Any]) -> bool:
         """Pop the minimum cost item from this heap"""
-        while True:
-            # break condition and data race resolution
-            # A little bit cryptic?
-            self.lock_heap.acquire()  # pylint: disable=R1732
-            if not self.heap:
-                if len(self.futures) == 0:
-                    return None
-                self.lock_heap.release()
-                while self.futures:
-                    fut = self.futures.popleft()
-                    if fut.done():
-                        continue
-                    _ = self.futures.popleft().result()
-                    break
-                continue
-            self.lock_heap.release()
+        with self.lock_heap:
+            while not self.heap and self.n_outstanding > 0 and self.exception is None and not self.stopped:
+                self.has_item.wait()
+            if self.exception is not None:
+                raise self.exception
+            if not self.heap or self.stopped:
+                return False
 
             # Do pop and re-register the iterator
-            with self.lock_heap:
-                cost, _, node, rest = heappop(self.heap)
-                self.futures.append(
-                    self.internal_threads.submit(
-                        self._internal_push, rest,
-                    )
-                )
+            out[0], _, out[1], rest = heappop(self.heap)
+            self.pending.append(rest)
+            self.n_outstanding += 1
+            self.has_work.notify()
+        return True
+
+    def _work(self) -> None:
+        # The lock is held except while advancing an iterator, so that handing in
+        # the advanced item and taking the next iterator share a single acquisition
+        with self.lock_heap:
+            while True:
+                while not self.pending and not self.stopped:
+                    self.has_work.wait()
+                if self.stopped:
+                    return
+                sorted_iterator = self.pending.popleft()
 
-            return (cost, node)
-
-    def _internal_push(self, sorted_iterator: SortedIterator[Cost, Node]):
-        try:
-            cost_next, node_next = next(sorted_iterator)
-            with self.lock_heap:
-                heappush(self.heap, (cost_next, self.index, node_next, sorted_iterator))
-                self.index += 1
-        except StopIteration:
-            pass
+                self.lock_heap.release()
+                exception: Optional[BaseException] = None
+                try:
+                    item = next(sorted_iterator, None)
+                except BaseException as exc:  # pylint: disable=broad-except
+                    item, exception = None, exc
+                finally:
+                    self.lock_heap.acquire()  # pylint: disable=R1732  # re-taken for the enclosing with block
+
+                if self.stopped:
+                    return
+                if item is not None:
+                    heappush(self.heap, (item[0], id(sorted_iterator), item[1], sorted_iterator))
+                if exception is not None:
+                    self.exception = exception
+                self.n_outstanding -= 1
+                self.has_item.notify()
 
     push.__doc__ = LazyHeap.push.__doc__
-    pop.__doc__ = LazyHeap.pop.__doc__
+    pop_into.__doc__ = LazyHeap.pop_into.__doc__
@@ -1,11 +1,73 @@
 """Best first search with pre-sorted iterator"""
-from typing import Callable, Dict, Iterator, Optional, Tuple
+from typing import Any, Callable, Iterator, List, Optional, Tuple, cast
 import itertools
+import operator
 
 from .heap import Cost, LazyHeap, Node, SortedIterator
 
+# Path as a linked list from its last node back to the first one,
+# so that extending a path does not copy it
+Path = Tuple[Node, Any]
 
-def best_first_search(
+
+def _path_to_nodes(path: Optional[Path]) -> Tuple[Node, ...]:
+    """Unroll linked list of nodes from the first node to the last one"""
+    nodes: List[Node] = []
+    while path is not None:
+        node, path = path
+        nodes.append(node)
+    return tuple(reversed(nodes))
+
+
+def _make_iterate(
+    get_sorted_neighbor_iterator: Callable[[Node], SortedIterator[Cost, Node]],
+    cost_add: Callable[[Cost, Cost], Cost],
+    node2best_cost: Any,
+) -> Callable[[Cost, Path], SortedIterator]:
+    """
+    Make the function expanding a path into its extensions, in cost ascending order.
+    `node2best_cost` and `cost_add` are fixed for the whole search, so branch once here rather than for every neighbor.
+
+    Args:
+        node2best_cost: known bounds as Dict[Node, Optional[Cost]] or List[Optional[Cost]] indexed by node,
+            updated by the expansion. `None` not to prune.
+    """
+    if node2best_cost is not None:
+        get_best_cost = node2best_cost.get if isinstance(node2best_cost, dict) else node2best_cost.__getitem__
+
+        def _iterate(cost: Cost, path: Path) -> SortedIterator:
+            for _cost, _node in get_sorted_neighbor_iterator(path[0]):
+                cost_total = cost_add(cost, _cost)
+                if (best_cost := get_best_cost(_node)) is not None and best_cost <= cost_total:
+                    # There was a better path to this node
+                    continue
+                node2best_cost[_node] = cost_total
+                yield cost_total, (_node, path)
+
+        def _iterate_add(cost: Any, path: Path) -> SortedIterator:
+            """Same as `_iterate`, with `cost_add` inlined for `operator.add`"""
+            for _cost, _node in get_sorted_neighbor_iterator(path[0]):
+                cost_total = cost + _cost
+                if (best_cost := get_best_cost(_node)) is not None and best_cost <= cost_total:
+                    # There was a better path to this node
+                    continue
+                node2best_cost[_node] = cost_total
+                yield cost_total, (_node, path)
+    else:
+        def _iterate(cost: Cost, path: Path) -> SortedIterator:
+            for _cost, _node in get_sorted_neighbor_iterator(path[0]):
+                yield cost_add(cost, _cost), (_node, path)
+
+        def _iterate_add(cost: Any, path: Path) -> SortedIterator:
+            """Same as `_iterate`, with `cost_add` inlined for `operator.add`"""
+            for _cost, _node in get_sorted_neighbor_iterator(path[0]):
+                yield cost + _cost, (_node, path)
+
+    return _iterate_add if cost_add is operator.add else _iterate
+
+
+# Keyword options count as locals; the hot loop keeps its state in locals on purpose
+def best_first_search(  # pylint: disable=too-many-locals
     initial_cost: Cost,
     initial_node: Node,
     get_sorted_neighbor_iterator: Callable[[Node], SortedIterator[Cost, Node]],
@@ -14,6 +76,8 @@ def best_first_search(
     memoize_bound: bool = True,
     n_max_iters: Optional[int] = None,
     n_thread: int = 0,
+    n_nodes: Optional[int] = None,
+    integer_cost: bool = False,
 ) -> Iterator[Tuple[Cost, int, Tuple[Node, ...]]]:
     """
     Best first search function, as a minimization problem.
@@ -26,51 +90,60 @@ def best_first_search(
         is_solution (Callable[[Node], bool]): termination condition
         memoize_bound (bool):
             Prune search by using known bound to reach the node.
+            Paths superseded by a cheaper one to the same node are not expanded.
             When state space is known to be a tree, set this to `False` to save some memory.
         n_thread (int):
             Number of python threads to be used.
             It can be useful if `sorted_iterator` involves heavy external function call.
             When given 0, runs in main thread.
+        n_nodes (Optional[int]):
+            When nodes are integers in `range(n_nodes)`, give `n_nodes` to keep the known bounds
+            in a list indexed by node instead of a dict.
+        integer_cost (bool):
+            When every cost is a non-negative integer within a small range, set this to `True`
+            to keep the frontier in a bucket queue instead of a binary heap. Ignored when `n_thread > 0`.
 
     Yields:
         Iterator[Tuple[Cost, int, Tuple[Node, ...]]]: cost, steps, solution
     """
     if memoize_bound:
-        node2best_cost: Dict[Node, Optional[Cost]] = {}
-    heap: LazyHeap[Cost, Tuple[Node, ...]] = LazyHeap.new(n_thread)
-    heap.push(iter([(initial_cost, (initial_node,))]))
-
-    def _iterate(cost: Cost, nodes: Tuple[Node, ...]) -> SortedIterator:
-        for _cost, _node in get_sorted_neighbor_iterator(nodes[-1]):
-            cost_total = cost_add(cost, _cost)
-            if memoize_bound:
-                if (
-                    (best_cost := node2best_cost.get(_node, None)) is not None
-                    and best_cost <= cost_total
-                ):
-                    # There was a better path to this node
-                    continue
-                node2best_cost[_node] = cost_total
-            yield cost_total, (*nodes, _node)
+        # Dict[Node, Optional[Cost]], or List[Optional[Cost]] indexed by node
+        node2best_cost: Any = {} if n_nodes is None else [None] * n_nodes
+        node2best_cost[initial_node] = initial_cost
+    heap: LazyHeap[Cost, Path] = LazyHeap.new(n_thread, integer_cost)
+    heap.push(iter([(initial_cost, (initial_node, None))]))
+
+    iterate = _make_iterate(
+        get_sorted_neighbor_iterator, cost_add, node2best_cost if memoize_bound else None,
+    )
+
+    top: List[Any] = [initial_cost, (initial_node, None)]  # reused for every pop; overwritten before read
+    # Stop the heap also when the caller abandons this generator, e.g. after the first solution,
+    # so that worker threads of the multithreaded heap do not outlive the search
+    try:
+        for n_iter in itertools.count():
+            has_item = heap.pop_into(top)
 
-    for n_iter in itertools.count():
-        heapitem = heap.pop()
+            # Too many iterations
+            if n_max_iters is not None and n_iter >= n_max_iters:
+                return
 
-        # Too many iterations
-        if n_max_iters is not None and n_iter >= n_max_iters:
-            heap.stop()
-            return
+            # No more to search
+            if not has_item:
+                return
+            cost, path = cast(Tuple[Cost, Path], top)
+            node = path[0]
 
-        # No more to search
-        if heapitem is None:
-            heap.stop()
-            return
-        cost, nodes = heapitem
+            # A better path to this node was found after this one had been pushed
+            if memoize_bound and (best_cost := node2best_cost[node]) is not None and best_cost < cost:
+                continue
 
-        # if not solution, continue searching
-        if not is_solution(nodes[-1]):
-            heap.push(_iterate(cost, nodes))
-            continue
+            # if not solution, continue searching
+            if not is_solution(node):
+                heap.push(iterate(cost, path))
+                continue
 
-        # solution found!
-        yield (cost, n_iter, nodes)
+            # solution found!
+            yield (cost, n_iter, _path_to_nodes(path))
+    finally:
+        heap.stop()
@@ -3,10 +3,14 @@ Implement A* using `best_first_search`, and solve the problem illustrated in the
 
 https://upload.wikimedia.org/wikipedia/commons/8/85/Weighted_A_star_with_eps_5.gif
 """
+import threading
+import time
+
 import networkx as nx
+import numpy as np
 import pytest
 
-from best_first_search.example import a_star, a_star_debug
+from best_first_search.example import a_star, a_star_debug, a_star_grid
 
 
 def _grid_graph(size: int) -> nx.Graph:
@@ -72,6 +76,14 @@ def _impossible_graph(size: int) -> nx.Graph:
     return graph
 
 
+def _blocked(graph: nx.Graph, size: int) -> np.ndarray:
+    """Dense grid representation of the graphs above"""
+    blocked = np.ones((size + 1, size + 1), dtype=np.uint8)
+    for x, y in graph.nodes:
+        blocked[x, y] = 0
+    return blocked
+
+
 @pytest.mark.parametrize("size", range(20, 21))
 def test_singlethread(size: int) -> None:
     """Single threaded test"""
@@ -82,6 +94,16 @@ def test_singlethread(size: int) -> None:
     assert solution[-1] == (size, size)
 
 
+@pytest.mark.parametrize("size", range(20, 21))
+def test_singlethread_quantized(size: int) -> None:
+    """Single threaded test with integer costs"""
+    graph = _grid_graph(size)
+    cost, _, solution = a_star(graph, (0, 0), (size, size), n_thread=0, cost_scale=100)
+    assert abs(2 * size - 9 - cost) < 1e-7
+    assert len(solution) == 1 + round(cost)
+    assert solution[-1] == (size, size)
+
+
 @pytest.mark.parametrize("size", range(20, 21))
 def test_multithread(size: int) -> None:
     """Multi threaded test"""
@@ -92,18 +114,58 @@ def test_multithread(size: int) -> None:
     assert solution[-1] == (size, size)
 
 
+@pytest.mark.parametrize("size", range(20, 21))
+def test_multithread_no_thread_leak(size: int) -> None:
+    """Worker threads exit once the first solution is taken"""
+    graph = _grid_graph(size)
+    n_thread_before = threading.active_count()
+    for _ in range(3):
+        a_star(graph, (0, 0), (size, size), n_thread=4)
+    deadline = time.monotonic() + 5
+    while threading.active_count() > n_thread_before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert threading.active_count() <= n_thread_before  # workers of earlier tests may still be exiting
+
+
 @pytest.mark.parametrize("size", range(10, 11))
 def test_singlethread_impossible(size: int) -> None:
     """Single threaded test"""
     assert a_star(_impossible_graph(size), (0, 0), (size, size), n_thread=0) is None
 
 
+@pytest.mark.parametrize("size", range(10, 11))
+def test_node_out_of_graph(size: int) -> None:
+    """Start or end node missing from the graph"""
+    graph = _grid_graph(size)
+    assert a_star(graph, (0, 0), (size + 5, size + 5)) is None
+    assert a_star(graph, (size + 5, size + 5), (0, 0)) is None
+    assert a_star(graph, (size + 5, size + 5), (size + 5, size + 5)) == (0., 0, ((size + 5, size + 5),))
+
+
 @pytest.mark.parametrize("size", range(10, 11))
 def test_multithread_impossible(size: int) -> None:
     """Multi threaded test"""
     assert a_star(_impossible_graph(size), (0, 0), (size, size), n_thread=4) is None
 
 
+@pytest.mark.parametrize("size", range(20, 21))
+def test_grid(size: int) -> None:
+    """Numba compiled grid test"""
+    graph = _grid_graph(size)
+    cost, _, solution = a_star_grid(_blocked(graph, size), (0, 0), (size, size))
+    assert abs(2 * size - 9 - cost) < 1e-7
+    assert len(solution) == 1 + round(cost)
+    assert solution[0] == (0, 0)
+    assert solution[-1] == (size, size)
+    assert all(graph.has_edge(a, b) for a, b in zip(solution, solution[1:]))
+
+
+@pytest.mark.parametrize("size", range(10, 11))
+def test_grid_impossible(size: int) -> None:
+    """Numba compiled grid test"""
+    assert a_star_grid(_blocked(_impossible_graph(size), size), (0, 0), (size, size)) is None
+
+
 @pytest.mark.visualize
 @pytest.mark.parametrize("size", range(15, 16))
 def test_visualize(size: int) -> None:
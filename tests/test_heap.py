@@ -0,0 +1,53 @@
+"""Tests on lazy heap implementations"""
+import operator
+
+import pytest
+
+from best_first_search import best_first_search
+from best_first_search.heap import LazyBucketQueue, LazyHeap
+
+
+def test_multithread_exception() -> None:
+    """Exception raised by a neighbor iterator in a worker thread reaches the caller"""
+    def get_neighbor(node: int):
+        if node >= 3:
+            raise ValueError(node)
+        return iter([(1, node + 1)])
+
+    with pytest.raises(ValueError):
+        next(best_first_search(0, 0, get_neighbor, lambda _: False, operator.add, n_thread=2))
+
+
+def test_multithread_pop_after_stop() -> None:
+    """Stopped heap reports exhaustion instead of waiting for its workers, even after a push"""
+    heap = LazyHeap.new(n_thread=2)
+    heap.push(iter([(1, 'a'), (2, 'b')]))
+    heap.stop()
+    assert heap.pop() is None
+    heap.push(iter([(1, 'c')]))
+    assert heap.pop() is None
+
+
+def test_bucket_queue_fifo() -> None:
+    """Items of the same cost pop in the order they were pushed"""
+    heap = LazyBucketQueue()
+    heap.push(iter([(1, 'a'), (3, 'c')]))
+    heap.push(iter([(1, 'b'), (2, 'd')]))
+    assert [heap.pop() for _ in range(5)] == [(1, 'a'), (1, 'b'), (2, 'd'), (3, 'c'), None]
+
+
+def test_bucket_queue_push_below_min() -> None:
+    """Pushing below the last popped cost is still popped first"""
+    heap = LazyBucketQueue()
+    heap.push(iter([(5, 'a'), (7, 'b')]))
+    assert heap.pop() == (5, 'a')
+    heap.push(iter([(2, 'c')]))
+    assert [heap.pop() for _ in range(3)] == [(2, 'c'), (7, 'b'), None]
+
+
+@pytest.mark.parametrize("cost", [-1, 2.5])
+def test_bucket_queue_invalid_cost(cost) -> None:
+    """Negative or fractional costs are rejected"""
+    heap = LazyBucketQueue()
+    with pytest.raises(ValueError):
+        heap.push(iter([(cost, 'a')]))